@@ -3,23 +3,105 @@ from tkinter import filedialog, messagebox, colorchooser
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.tooltip import ToolTip
-from PIL import Image, ImageTk
-import qrcode
-import qrcode.constants
+from PIL import Image, ImageTk, ImageColor
+import numpy as np
+import segno
 import cv2
-import json
+import orjson
+import ijson
 import os
+import re
+import queue
+import sqlite3
+import tempfile
 import threading
 import webbrowser
 from pyzxing import BarCodeReader
+from pyzbar.pyzbar import decode as zbar_decode
 from datetime import datetime
 import csv
-from typing import Optional, Dict, Any
+import gzip
+import functools
+import io
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future
+from itertools import repeat
+from collections.abc import MutableMapping
+from typing import Optional, Dict, Any, Tuple, Callable, List
 
 # --- Constants ---
-DATA_FILE = "products_database.json"
+DATA_FILE = "products.db"
+LEGACY_DATA_FILE = "products_database.json"
 QRS_FOLDER = "QRCodes"
 CONFIG_FILE = "app_config.json"
+WEBCAM_PREVIEW_SIZE = (640, 480)
+WEBCAM_CAPTURE_SIZE = (640, 480)  # Plenty for decoding; 1080p only costs bandwidth.
+ANALYSIS_CACHE_SIZE = 1024
+PRODUCTS_FLUSH_DELAY_MS = 500
+QR_CACHE_SIZE = 256
+PRICE_FORMAT_CACHE_SIZE = 4096
+QR_SCALE = 10
+QR_BORDER = 4
+BATCH_CHUNK_SIZE = 8
+BATCH_PROGRESS_EVERY = 25
+BATCH_POOL_THRESHOLD = 32  # Below this, spawning workers (each re-imports this module) costs more than it saves.
+DB_PAGE_SIZE = 200
+LEGACY_IMPORT_BATCH = 1000
+CSV_WRITE_BUFFER = 1 << 20
+SCHEME_RE = re.compile(r'(WIFI:|https?://|mailto:|tel:)')
+# Background file writes (CSV exports, saved QR images), so they never block the Tk event loop.
+IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="quantumlink-io")
+SCHEME_TYPES = {"WIFI:": "Wi-Fi Network", "http://": "URL", "https://": "URL", "mailto:": "Email Address", "tel:": "Phone Number"}
+
+# --- Price Helpers ---
+# Prices are stored as floats and only formatted for display/export.
+# Catalogues reuse a handful of price points, so formatted strings are cached and shared.
+@functools.lru_cache(maxsize=PRICE_FORMAT_CACHE_SIZE)
+def _fmt_price(value: float) -> str:
+    return f"₹{value:,.2f}"
+
+def _parse_price(value: Any) -> float:
+    """Accepts legacy formatted prices such as '₹1,200.00' as well as plain numbers."""
+    return float(str(value).replace('₹', '').replace(',', ''))
+
+# --- Webcam Helpers ---
+# Webcam colour conversion goes through OpenCL (UMat) only when a device is present.
+# Probed on first use, not at import: batch worker processes re-import this module and never touch the camera.
+@functools.lru_cache(maxsize=None)
+def _use_opencl() -> bool:
+    return cv2.ocl.haveOpenCL()
+
+# --- QR Rendering ---
+# Module-level so batch jobs can run them in worker processes.
+def _make_qr_png(data: str, fill: str, bg: str) -> Optional[bytes]:
+    """Returns None for data that can't be encoded (e.g. over QR capacity), so one bad batch line doesn't sink the rest."""
+    # segno encodes and writes the PNG itself, so plain codes never touch Pillow.
+    buf = io.BytesIO()
+    try: segno.make_qr(data, error='h').save(buf, kind='png', scale=QR_SCALE, border=QR_BORDER, dark=fill, light=bg)
+    except ValueError: return None  # segno.DataOverflowError is a ValueError.
+    return buf.getvalue()
+
+def render_qr_image(data: str, fill: str, bg: str, logo_path: Optional[str] = None) -> Image.Image:
+    # Paint the whole image in one vectorised pass from the module matrix instead of a PNG round-trip.
+    modules = np.pad(np.asarray(segno.make_qr(data, error='h').matrix, dtype=bool), QR_BORDER)
+    pixels = modules.repeat(QR_SCALE, axis=0).repeat(QR_SCALE, axis=1)
+    fill_rgb, bg_rgb = np.array(ImageColor.getrgb(fill)[:3], dtype=np.uint8), np.array(ImageColor.getrgb(bg)[:3], dtype=np.uint8)
+    img = Image.fromarray(np.where(pixels[..., None], fill_rgb, bg_rgb))
+    if logo_path:
+        logo = Image.open(logo_path)
+        basewidth = int(img.size[0] * 0.25)
+        wpercent = (basewidth/float(logo.size[0]))
+        hsize = int((float(logo.size[1])*float(wpercent)))
+        logo = logo.resize((basewidth, hsize), Image.LANCZOS)
+        pos = ((img.size[0] - logo.size[0]) // 2, (img.size[1] - logo.size[1]) // 2)
+        img.paste(logo, pos)
+    return img
+
+def save_qr_png(img: Image.Image, path: str):
+    # QR images are tiny and flat: fast deflate costs little size, and a two-colour
+    # code compresses faster still as a palette image than as RGB triples.
+    if img.getcolors(2): img = img.convert('P', palette=Image.ADAPTIVE, colors=2)
+    img.save(path, format='PNG', compress_level=1, optimize=False)
 
 class SplashScreen(ttk.Toplevel):
     """A professional splash screen that shows on app startup."""
@@ -41,6 +123,112 @@ class SplashScreen(ttk.Toplevel):
         self.progress.pack(pady=20, padx=40, fill=X)
         self.progress.start()
 
+class BufferlessVideoCapture:
+    """
+    Wraps cv2.VideoCapture with a daemon reader thread that keeps only the
+    newest frame, so a slow consumer never falls behind the camera.
+    Capture properties are applied before the reader starts, and an
+    optional transform runs on the reader thread for every good frame.
+    """
+    def __init__(self, index: int, api_preference: int = cv2.CAP_ANY, transform: Optional[Callable[[Any], Any]] = None,
+                 props: Optional[Dict[int, float]] = None):
+        self.cap = cv2.VideoCapture(index, api_preference)
+        self.transform = transform
+        for prop, value in (props or {}).items(): self.cap.set(prop, value)
+        self.frames: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize=1)
+        self._running = self.cap.isOpened()
+        self._reader_thread = threading.Thread(target=self._reader, daemon=True)
+        if self._running: self._reader_thread.start()
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def _reader(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            if ret and self.transform: frame = self.transform(frame)
+            try: self.frames.get_nowait()  # Drop the stale frame nobody consumed yet.
+            except queue.Empty: pass
+            self.frames.put((ret, frame))
+            if not ret: break
+
+    def read(self, poll_interval: float = 0.5) -> Tuple[bool, Any]:
+        """Waits for the next frame; returns (False, None) only once the reader has actually stopped."""
+        while True:
+            try: return self.frames.get(timeout=poll_interval)
+            except queue.Empty:
+                # A slow frame (e.g. DSHOW renegotiating MJPG) is not a lost feed; a dead reader is.
+                if self._reader_thread.is_alive(): continue
+                try: return self.frames.get_nowait()  # It may have queued a final frame just before exiting.
+                except queue.Empty: return False, None
+
+    def release(self):
+        self._running = False
+        if self._reader_thread.is_alive(): self._reader_thread.join(timeout=1)
+        self.cap.release()
+
+class ProductStore(MutableMapping):
+    """
+    Dict-like view of the SQLite product table, keyed by product ID.
+    Writes stay in an open transaction until commit() is called.
+    """
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        # WAL commits append to a log instead of rewriting pages through a rollback journal.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS products(id TEXT PRIMARY KEY, name TEXT NOT NULL, price REAL NOT NULL)")
+        self.conn.commit()
+
+    def __getitem__(self, pid: str) -> Dict[str, Any]:
+        row = self.conn.execute("SELECT name, price FROM products WHERE id = ?", (pid,)).fetchone()
+        if row is None: raise KeyError(pid)
+        return {"name": row[0], "price": row[1]}
+
+    def __setitem__(self, pid: str, product: Dict[str, Any]):
+        self.conn.execute(
+            "INSERT INTO products(id, name, price) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, price = excluded.price",
+            (pid, product['name'], product['price']))
+
+    def __delitem__(self, pid: str):
+        if self.conn.execute("DELETE FROM products WHERE id = ?", (pid,)).rowcount == 0: raise KeyError(pid)
+
+    def __contains__(self, pid) -> bool:
+        return self.conn.execute("SELECT 1 FROM products WHERE id = ?", (pid,)).fetchone() is not None
+
+    def __iter__(self):
+        return (row[0] for row in self.conn.execute("SELECT id FROM products ORDER BY rowid"))
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def rows(self) -> List[Tuple[str, str, float]]:
+        """All products as flat (id, name, price) tuples, ready for a Treeview or csv.writerows."""
+        return self.conn.execute("SELECT id, name, price FROM products ORDER BY rowid").fetchall()
+
+    def page(self, after_rowid: int, limit: int) -> List[Tuple[int, str, str, float]]:
+        """Up to `limit` (rowid, id, name, price) tuples following `after_rowid`; keyset paging stays cheap however deep the view scrolls."""
+        return self.conn.execute(
+            "SELECT rowid, id, name, price FROM products WHERE rowid > ? ORDER BY rowid LIMIT ?", (after_rowid, limit)).fetchall()
+
+    @property
+    def legacy_imported(self) -> bool:
+        """Whether the one-time import of LEGACY_DATA_FILE has already run (tracked in user_version)."""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+
+    def mark_legacy_imported(self):
+        # Part of the open transaction, if any, so it commits together with the imported rows.
+        self.conn.execute("PRAGMA user_version = 1")
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.commit(); self.conn.close()
+
 class QuantumLinkApp:
     """
     QuantumLink: An advanced QR and barcode utility for generation,
@@ -50,6 +238,9 @@ class QuantumLinkApp:
         self.root = root
         self.root.withdraw()
         SplashScreen(self.root)
+        # Warm the decoders up while the splash screen is showing.
+        self.barcode_reader = BarCodeReader()
+        threading.Thread(target=self._warmup_decoder, daemon=True).start()
         self.root.after(2500, self.initialize_main_app)
 
     def initialize_main_app(self):
@@ -61,18 +252,24 @@ class QuantumLinkApp:
         self.root.geometry(self.config.get("geometry", "1200x850"))
         
         # --- State Variables ---
-        self.products: Dict[str, Dict[str, Any]] = self.load_products()
-        self.scan_history = []
+        self.products: ProductStore = self.load_products()
+        self._products_dirty = False
+        self._products_flush_job: Optional[str] = None
+        self._analysis_cache: Dict[str, Dict[str, str]] = {}
         self.last_generated_qr_img: Optional[Image.Image] = None
         self.logo_path: Optional[str] = None
         self.qr_fill_color_hex = "#000000"
         self.qr_bg_color_hex = "#FFFFFF"
+        self._edit_window: Optional[ttk.Toplevel] = None
+        self._last_clip: Optional[str] = None
+        self._skip_confirm = False
+        self._qr_cache = functools.lru_cache(maxsize=QR_CACHE_SIZE)(self._render_qr_image)
         
         # --- Webcam and Scanning Control ---
-        self.cap: Optional[cv2.VideoCapture] = None
+        self.cap: Optional[BufferlessVideoCapture] = None
         self.is_scanning_webcam = False
         self.webcam_thread: Optional[threading.Thread] = None
-        self.barcode_reader = BarCodeReader()
+        self._preview_photo: Optional[ImageTk.PhotoImage] = None
         self.webcam_available = self.check_webcam()
 
         # --- UI Setup ---
@@ -80,6 +277,10 @@ class QuantumLinkApp:
         self.create_widgets()
         self.populate_database_view()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        # Anything that may have replaced the clipboard behind our back invalidates the cached copy:
+        # another app (after we lose focus) or an Entry/Text <<Copy>>/<<Cut>> inside this one.
+        self.root.bind("<FocusOut>", self._forget_clipboard, add="+")
+        for seq in ("<<Copy>>", "<<Cut>>"): self.root.bind_all(seq, self._forget_clipboard, add="+")
         self.update_status("Welcome to QuantumLink!")
 
     def check_webcam(self) -> bool:
@@ -90,36 +291,70 @@ class QuantumLinkApp:
                 return True
         except Exception: pass
         return False
+
+    def _warmup_decoder(self):
+        """Decodes a throwaway QR in the background so the first real scan isn't a cold start."""
+        try:
+            warmup_img = render_qr_image("QuantumLink", "#000000", "#FFFFFF").convert('L')
+            zbar_decode(warmup_img)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                warmup_path = os.path.join(tmp_dir, "warmup.png")
+                warmup_img.save(warmup_path)
+                self.barcode_reader.decode(warmup_path)
+        except Exception: pass
         
     # --- Configuration and Data Handling ---
     def load_app_config(self) -> Dict[str, Any]:
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, "r") as f: return json.load(f)
-            except (json.JSONDecodeError, IOError): return {}
-        return {"theme": "cyborg"}
+        try:
+            with open(CONFIG_FILE, "rb") as f: return orjson.loads(f.read())
+        except FileNotFoundError: return {"theme": "cyborg"}
+        except (orjson.JSONDecodeError, IOError): return {}
 
     def save_app_config(self):
+        self.config["geometry"] = self.root.winfo_geometry()
+        self.config["theme"] = self.root.style.theme_use()
+        tmp_path = CONFIG_FILE + ".tmp"
         try:
-            with open(CONFIG_FILE, "w") as f:
-                self.config["geometry"] = self.root.winfo_geometry()
-                self.config["theme"] = self.root.style.theme_use()
-                json.dump(self.config, f, indent=4)
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(self.config, option=orjson.OPT_INDENT_2)); f.flush(); os.fsync(f.fileno())
+            os.replace(tmp_path, CONFIG_FILE)
         except IOError: print("Warning: Could not save app configuration.")
 
-    def load_products(self) -> Dict[str, Dict[str, Any]]:
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, "r") as f: return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                messagebox.showerror("Database Error", f"Could not read '{DATA_FILE}'.\nError: {e}")
-                return {}
-        return {}
+    def load_products(self) -> ProductStore:
+        try: store = ProductStore(DATA_FILE)
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Could not open '{DATA_FILE}'.\nError: {e}")
+            return ProductStore(":memory:")
+        if store.legacy_imported: return store
+        # One-time migration from the old JSON database, streamed so a large file is never held in memory.
+        try:
+            if os.path.exists(LEGACY_DATA_FILE):
+                with open(LEGACY_DATA_FILE, "rb") as f:
+                    for count, (pid, product) in enumerate(ijson.kvitems(f, ''), 1):
+                        store[pid] = {"name": product['name'], "price": _parse_price(product['price'])}
+                        if count % LEGACY_IMPORT_BATCH == 0: self.root.update_idletasks()
+            store.mark_legacy_imported()
+            store.commit()
+        except (ijson.JSONError, IOError, KeyError, ValueError, sqlite3.Error) as e:
+            store.rollback()  # All or nothing, so a failed import is retried cleanly on the next start.
+            messagebox.showerror("Database Error", f"Could not import '{LEGACY_DATA_FILE}'.\nError: {e}")
+        return store
 
     def save_products(self):
+        self._analysis_cache.clear()  # Product lookups inside cached analyses may now be stale.
+        self._products_dirty = True
+        if self._products_flush_job is None:
+            self._products_flush_job = self.root.after(PRODUCTS_FLUSH_DELAY_MS, self._flush_products)
+
+    def _flush_products(self):
+        """Commits pending product changes, so a burst of edits costs a single transaction."""
+        if self._products_flush_job is not None:
+            self.root.after_cancel(self._products_flush_job); self._products_flush_job = None
+        if not self._products_dirty: return
         try:
-            with open(DATA_FILE, "w") as f: json.dump(self.products, f, indent=4)
-        except IOError as e: messagebox.showerror("Database Error", f"Could not save data to '{DATA_FILE}'.\nError: {e}")
+            self.products.commit()
+            self._products_dirty = False
+        except sqlite3.Error as e: messagebox.showerror("Database Error", f"Could not save data to '{DATA_FILE}'.\nError: {e}")
 
     # --- Main UI Creation ---
     def create_menu(self):
@@ -290,7 +525,10 @@ class QuantumLinkApp:
     def setup_database_tab(self, parent):
         db_frame = ttk.Frame(parent)
         db_frame.pack(fill='both', expand=True)
-        self.db_tree = self.setup_treeview_tab(db_frame, cols=("Product ID", "Product Name", "Price"))
+        self._db_last_rowid = 0  # Keyset cursor: rowid of the last product inserted into the view.
+        self._db_exhausted = False
+        self._db_load_pending = False
+        self.db_tree = self.setup_treeview_tab(db_frame, cols=("Product ID", "Product Name", "Price"), on_scroll=self._on_db_scroll)
         
         button_frame = ttk.Frame(db_frame)
         button_frame.pack(pady=10, fill=X)
@@ -313,32 +551,53 @@ class QuantumLinkApp:
         delete_btn.pack(side=LEFT, expand=True, padx=10)
 
     # --- UI Components and Updaters ---
-    def setup_treeview_tab(self, parent, cols):
+    def setup_treeview_tab(self, parent, cols, on_scroll: Optional[Callable[[float], None]] = None):
         tree = ttk.Treeview(parent, columns=cols, show='headings', bootstyle=PRIMARY)
         for col in cols: tree.heading(col, text=col); tree.column(col, width=150, anchor=W)
         vsb = ttk.Scrollbar(parent, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=vsb.set); tree.pack(side=LEFT, fill='both', expand=True); vsb.pack(side=RIGHT, fill='y')
+        def yscroll(first, last):
+            vsb.set(first, last)
+            if on_scroll: on_scroll(float(last))
+        tree.configure(yscrollcommand=yscroll); tree.pack(side=LEFT, fill='both', expand=True); vsb.pack(side=RIGHT, fill='y')
         return tree
     def populate_database_view(self):
-        for i in self.db_tree.get_children(): self.db_tree.delete(i)
-        for pid, data in self.products.items():
-            self.db_tree.insert("", "end", values=(pid, data['name'], data['price']))
+        self.db_tree.delete(*self.db_tree.get_children())
+        self._db_last_rowid, self._db_exhausted = 0, False
+        self._load_more_db_rows()
         self.update_status(f"Database loaded with {len(self.products)} products.")
-    def populate_history_view(self):
-        if hasattr(self, 'history_tree'):
-            for i in self.history_tree.get_children(): self.history_tree.delete(i)
-            for item in self.scan_history:
-                self.history_tree.insert("", "end", values=(item['timestamp'], item['type'], item['data']))
+    def _load_more_db_rows(self):
+        """Fetches and inserts the next page of products; further pages are added as the view scrolls toward the end."""
+        self._db_load_pending = False
+        if self._db_exhausted: return
+        page = self.products.page(self._db_last_rowid, DB_PAGE_SIZE)
+        self._db_exhausted = len(page) < DB_PAGE_SIZE
+        if not page: return
+        tree = self.db_tree
+        selectmode = tree.cget('selectmode')
+        # Hide columns and selection handling so bulk inserts don't re-layout per row.
+        tree.configure(displaycolumns=(), selectmode='none')
+        insert = tree.insert
+        # Only the rows actually being shown get their price formatted.
+        for _, pid, name, price in page: insert("", "end", iid=pid, values=(pid, name, _fmt_price(price)))  # iid is the product ID.
+        tree.configure(displaycolumns="#all", selectmode=selectmode)
+        self._db_last_rowid = page[-1][0]
+    def _update_db_row(self, item: str, values: Tuple[str, str, str]):
+        """Rewrites a single loaded row in place rather than repopulating the whole view."""
+        self.db_tree.item(item, values=values)
+    def _remove_db_row(self, item: str):
+        self.db_tree.delete(item)  # The keyset cursor is unaffected by deleting rows already shown.
+    def _on_db_scroll(self, last: float):
+        if last >= 0.9 and not self._db_exhausted and not self._db_load_pending:
+            self._db_load_pending = True
+            self.root.after_idle(self._load_more_db_rows)
     def display_qr_preview(self, img: Image.Image):
         self.last_generated_qr_img = img 
         self.save_qr_button.config(state=NORMAL)
         try:
-            w, h = img.size
             max_size = 300
-            aspect_ratio = w / h
-            if w > h: new_w, new_h = max_size, int(max_size / aspect_ratio)
-            else: new_h, new_w = max_size, int(max_size * aspect_ratio)
-            resized_img = img.resize((new_w, new_h), Image.LANCZOS)
+            # A QR thumbnail is two-tone, so BILINEAR looks the same as LANCZOS at a fraction of the cost.
+            resized_img = img.copy()
+            resized_img.thumbnail((max_size, max_size), Image.BILINEAR)
             self.qr_image_preview = ImageTk.PhotoImage(resized_img)
             self.qr_preview_label.config(image=self.qr_image_preview, text="")
         except Exception as e:
@@ -348,33 +607,28 @@ class QuantumLinkApp:
     # --- Core Functionality ---
     def _generate_qr_image(self, data: str, logo_path: Optional[str]) -> Optional[Image.Image]:
         try:
-            qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_H, box_size=10, border=4)
-            qr.add_data(data)
-            qr.make(fit=True)
-            img = qr.make_image(fill_color=self.qr_fill_color_hex, back_color=self.qr_bg_color_hex).convert('RGB')
-            if logo_path and os.path.exists(logo_path):
-                logo = Image.open(logo_path)
-                basewidth = int(img.size[0] * 0.25)
-                wpercent = (basewidth/float(logo.size[0]))
-                hsize = int((float(logo.size[1])*float(wpercent)))
-                logo = logo.resize((basewidth, hsize), Image.LANCZOS)
-                pos = ((img.size[0] - logo.size[0]) // 2, (img.size[1] - logo.size[1]) // 2)
-                img.paste(logo, pos)
-            return img
+            # The logo's mtime is part of the key so editing the file on disk invalidates the entry.
+            logo_key = (logo_path, os.path.getmtime(logo_path)) if logo_path and os.path.exists(logo_path) else None
+            return self._qr_cache(data, self.qr_fill_color_hex, self.qr_bg_color_hex, logo_key).copy()
         except Exception as e: self.update_status(f"QR Generation Error: {e}", is_error=True); return None
 
+    def _render_qr_image(self, data: str, fill: str, bg: str, logo_key: Optional[Tuple[str, float]]) -> Image.Image:
+        return render_qr_image(data, fill, bg, logo_key[0] if logo_key else None)
+
     def generate_product_qr(self):
         pid, name, price_str = self.entry_id.get().strip(), self.entry_name.get().strip(), self.entry_price.get().strip()
         if not all([pid, name, price_str]): self.update_status("All product fields are required.", is_error=True); return
-        try: price_val = float(price_str)
+        try:
+            price_val = float(price_str)
+            if not math.isfinite(price_val): raise ValueError(price_str)  # SQLite stores NaN as NULL, which the NOT NULL column rejects.
         except ValueError: self.update_status("Price must be a valid number.", is_error=True); return
         img = self._generate_qr_image(pid, self.logo_path)
         if img:
             os.makedirs(QRS_FOLDER, exist_ok=True)
             safe_filename = "".join(c for c in pid if c.isalnum() or c in ('-', '_')).rstrip()
             filename = os.path.join(QRS_FOLDER, f"{safe_filename}.png")
-            img.save(filename)
-            self.products[pid] = {"name": name, "price": f"₹{price_val:.2f}"}
+            save_qr_png(img, filename)
+            self.products[pid] = {"name": name, "price": price_val}
             self.save_products()
             self.populate_database_view()
             self.display_qr_preview(img)
@@ -390,19 +644,35 @@ class QuantumLinkApp:
         if not any(data_lines): self.update_status("No data for batch generation.", is_error=True); return
         output_folder = filedialog.askdirectory(title="Select Folder to Save Batch QR Codes")
         if not output_folder: self.update_status("Batch generation cancelled."); return
-        log_data = []
-        for i, line in enumerate(data_lines):
-            data = line.strip()
-            if not data: continue
-            img = self._generate_qr_image(data, logo_path=None)
-            if img:
+        items = [(i, line.strip()) for i, line in enumerate(data_lines) if line.strip()]
+        args = ([data for _, data in items], repeat(self.qr_fill_color_hex), repeat(self.qr_bg_color_hex))
+        try:
+            if len(items) < BATCH_POOL_THRESHOLD:
+                log_data, skipped = self._save_batch_pngs(items, map(_make_qr_png, *args), output_folder)
+            else:
+                ex = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, math.ceil(len(items) / BATCH_CHUNK_SIZE)))
+                try: log_data, skipped = self._save_batch_pngs(items, ex.map(_make_qr_png, *args, chunksize=BATCH_CHUNK_SIZE), output_folder)
+                finally: ex.shutdown(cancel_futures=True)
+            with open(os.path.join(output_folder, 'batch_log.csv'), 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f); writer.writerow(['InputData', 'Filename']); writer.writerows(log_data)
+        except Exception as e: self.update_status(f"Batch generation failed: {e}", is_error=True); return
+        summary = f"{len(log_data)} QR codes generated in '{output_folder}'."
+        if skipped: summary += f"\n{len(skipped)} line(s) could not be encoded and were skipped: {', '.join(map(str, skipped[:20]))}"
+        messagebox.showinfo("Batch Complete", summary)
+        self.update_status("Batch generation complete.")
+
+    def _save_batch_pngs(self, items: List[Tuple[int, str]], pngs, output_folder: str) -> Tuple[List[List[str]], List[int]]:
+        """Writes each generated PNG; returns the log rows and the (1-based) line numbers that failed to encode."""
+        log_data, skipped = [], []
+        for n, ((i, data), png) in enumerate(zip(items, pngs), 1):
+            if png is None: skipped.append(i + 1)
+            else:
                 safe_filename = f"qr_{i+1}_{''.join(c for c in data if c.isalnum())[:20]}.png"
-                img.save(os.path.join(output_folder, safe_filename))
+                with open(os.path.join(output_folder, safe_filename), 'wb') as f: f.write(png)
                 log_data.append([data, safe_filename])
-        with open(os.path.join(output_folder, 'batch_log.csv'), 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f); writer.writerow(['InputData', 'Filename']); writer.writerows(log_data)
-        messagebox.showinfo("Batch Complete", f"{len(log_data)} QR codes generated in '{output_folder}'.")
-        self.update_status("Batch generation complete.")
+            if n % BATCH_PROGRESS_EVERY == 0:
+                self.update_status(f"Generated {n}/{len(items)} QR codes..."); self.root.update_idletasks()
+        return log_data, skipped
 
     def process_scanned_data(self, data: str):
         self.root.bell()
@@ -434,12 +704,22 @@ class QuantumLinkApp:
     def start_webcam_scan(self):
         self.is_scanning_webcam = True
         self.scan_toggle_button.config(text="🛑 Stop Live Scan", bootstyle=DANGER)
-        self.update_status("Starting webcam...")
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        self.update_status("Starting webcam..."); self.root.update_idletasks()  # Opening the camera blocks.
+        _use_opencl()  # Probe here, not on the capture thread's first frame.
+        self.cap = BufferlessVideoCapture(0, cv2.CAP_DSHOW, transform=self._prepare_webcam_frame, props={
+            cv2.CAP_PROP_BUFFERSIZE: 1,
+            cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*'MJPG'),
+            cv2.CAP_PROP_FRAME_WIDTH: WEBCAM_CAPTURE_SIZE[0],
+            cv2.CAP_PROP_FRAME_HEIGHT: WEBCAM_CAPTURE_SIZE[1],
+        })
         if not self.cap.isOpened():
             self.update_status("Webcam Error: Could not open camera.", is_error=True)
+            self.cap.release(); self.cap = None
             self.is_scanning_webcam = False; self.scan_toggle_button.config(text="📹 Start Live Scan", bootstyle=WARNING)
             return
+        # One Tk image reused for every frame; the loop only pastes new pixels into it.
+        self._preview_photo = ImageTk.PhotoImage(Image.new('RGB', WEBCAM_PREVIEW_SIZE))
+        self.webcam_label.config(image=self._preview_photo, text="")
         self.webcam_thread = threading.Thread(target=self._scan_webcam_loop, daemon=True)
         self.webcam_thread.start()
     def stop_webcam_scan(self):
@@ -447,51 +727,70 @@ class QuantumLinkApp:
         if self.webcam_thread and self.webcam_thread.is_alive(): self.webcam_thread.join(timeout=1)
         if self.cap: self.cap.release(); self.cap = None
         self.scan_toggle_button.config(text="📹 Start Live Scan", bootstyle=WARNING)
-        self.webcam_label.config(image='', text="\n\nWebcam feed stopped.\n\n")
+        self.webcam_label.config(image='', text="\n\nWebcam feed stopped.\n\n"); self._preview_photo = None
         self.update_status("Webcam scanning turned off.")
+    @staticmethod
+    def _prepare_webcam_frame(frame) -> Tuple[Any, Any]:
+        """Runs on the capture thread: downsized RGB for the preview, full-size gray for decoding."""
+        use_cl = _use_opencl()
+        if use_cl: frame = cv2.UMat(frame)
+        small = cv2.resize(frame, WEBCAM_PREVIEW_SIZE, interpolation=cv2.INTER_AREA)
+        rgb, gray = cv2.cvtColor(small, cv2.COLOR_BGR2RGB), cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return (rgb.get(), gray.get()) if use_cl else (rgb, gray)
     def _scan_webcam_loop(self):
-        self.root.after(0, self.update_status, "Live scanning active. Show code to camera.")
-        scan_interval, frame_count = 5, 0
-        while self.is_scanning_webcam and self.cap:
-            ret, frame = self.cap.read()
-            if not ret: self.root.after(0, self.update_status, "Webcam feed lost.", is_error=True); break
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_img = Image.fromarray(rgb_frame)
-            frame_count += 1
-            if frame_count % scan_interval == 0:
-                try:
-                    results = self.barcode_reader.decode(pil_img)
-                    if results and results[0].get('parsed'):
-                        data = results[0]['parsed']
-                        self.root.after(0, self.process_scanned_data, data)
-                        self.root.after(100, self.stop_webcam_scan)
-                        return
-                except Exception: pass
-            img_tk = ImageTk.PhotoImage(image=pil_img)
-            self.webcam_label.imgtk = img_tk
-            self.webcam_label.config(image=img_tk)
-        self.root.after(0, self.stop_webcam_scan)
+        # Bind everything the hot loop touches to locals once, rather than per frame.
+        after, cap, preview_photo, decode, frombuffer = self.root.after, self.cap, self._preview_photo, zbar_decode, Image.frombuffer
+        after(0, self.update_status, "Live scanning active. Show code to camera.")
+        if cap is None: return
+        while self.is_scanning_webcam:
+            ret, frames = cap.read()
+            if not ret:
+                if self.is_scanning_webcam: after(0, self.update_status, "Webcam feed lost.", True)
+                break
+            preview_rgb, gray = frames
+            try:
+                results = decode(gray)
+                if results:
+                    after(0, self.process_scanned_data, results[0].data)
+                    after(100, self.stop_webcam_scan)
+                    return
+            except Exception: pass
+            preview_photo.paste(frombuffer('RGB', WEBCAM_PREVIEW_SIZE, preview_rgb, 'raw', 'RGB', 0, 1))
+        after(0, self.stop_webcam_scan)
     def scan_from_image(self):
         file_path = filedialog.askopenfilename(title="Select an Image File", filetypes=[("Image Files", "*.png *.jpg *.jpeg *.bmp")])
         if not file_path: self.update_status("Image scan cancelled."); return
         self.update_status(f"Scanning image: {os.path.basename(file_path)}...")
+        threading.Thread(target=self._scan_image_worker, args=(file_path,), daemon=True).start()
+    def _scan_image_worker(self, file_path: str):
         try:
-            results = self.barcode_reader.decode(file_path)
-            if results and results[0].get('parsed'):
-                self.root.after(100, lambda: self.process_scanned_data(results[0]['parsed']))
-            else: self.update_status("Scan failed: No valid code found in image.", is_error=True)
-        except Exception as e: self.update_status(f"Scanning Error: {e}", is_error=True)
+            gray = cv2.imread(file_path, cv2.IMREAD_GRAYSCALE)
+            results = zbar_decode(gray) if gray is not None else []
+            if results: data = results[0].data
+            else:
+                # zbar lacks some symbologies (Aztec, MaxiCode, ...); fall back to ZXing.
+                zx_results = self.barcode_reader.decode(file_path)
+                data = zx_results[0].get('parsed') if zx_results else None
+            if data: self.root.after(0, self.process_scanned_data, data)
+            else: self.root.after(0, self.update_status, "Scan failed: No valid code found in image.", True)
+        except Exception as e: self.root.after(0, self.update_status, f"Scanning Error: {e}", True)
     def _analyze_scanned_data(self, data: str) -> Dict[str, str]:
-        if data in self.products: return {"type": "Product ID", "info": f"Name: {self.products[data]['name']}\nPrice: {self.products[data]['price']}"}
-        if data.startswith("WIFI:"): return {"type": "Wi-Fi Network"}
-        if data.startswith(("http://", "https://")): return {"type": "URL"}
-        if data.startswith("mailto:"): return {"type": "Email Address"}
-        if data.startswith("tel:"): return {"type": "Phone Number"}
-        return {"type": "Plain Text"}
+        analysis = self._analysis_cache.get(data)
+        if analysis is None:
+            analysis = self._classify_scanned_data(data)
+            if len(self._analysis_cache) >= ANALYSIS_CACHE_SIZE: self._analysis_cache.pop(next(iter(self._analysis_cache)))
+            self._analysis_cache[data] = analysis
+        return analysis
+    def _classify_scanned_data(self, data: str) -> Dict[str, str]:
+        product = self.products.get(data)
+        if product: return {"type": "Product ID", "info": f"Name: {product['name']}\nPrice: {_fmt_price(product['price'])}"}
+        scheme = SCHEME_RE.match(data)
+        return {"type": SCHEME_TYPES[scheme.group(1)] if scheme else "Plain Text"}
     def show_scan_result_window(self, data: str, analysis: Dict[str, str]):
         result_window = ttk.Toplevel(self.root, title="Scan Analysis")
         result_window.transient(self.root)
         result_window.geometry("500x350")
+        result_window.bind("<FocusOut>", self._forget_clipboard, add="+")  # Toplevel bindtags don't include root.
         ttk.Label(result_window, text="✅ Scan Successful", font="-size 16 -weight bold", bootstyle=SUCCESS).pack(pady=10)
         content_frame = ttk.Frame(result_window, padding=10); content_frame.pack(expand=True, fill=BOTH)
         ttk.Label(content_frame, text=f"Data Type: {analysis['type']}", font="-size 12").pack(anchor=W, pady=2)
@@ -508,61 +807,100 @@ class QuantumLinkApp:
 
     def edit_product(self):
         try:
-            selected_item_id = self.db_tree.selection()[0]
-            product_id = self.db_tree.item(selected_item_id, 'values')[0]
-            product_name = self.products[product_id]['name']
-            product_price = self.products[product_id]['price'].replace('₹', '')
-            edit_window = ttk.Toplevel(self.root, title="Edit Product")
-            edit_window.transient(self.root); edit_window.geometry("400x200")
-            form_frame = ttk.Frame(edit_window, padding=20)
-            form_frame.pack(expand=True, fill=BOTH); form_frame.columnconfigure(1, weight=1)
-            ttk.Label(form_frame, text="Product ID:").grid(row=0, column=0, sticky='w', pady=5)
-            ttk.Label(form_frame, text=product_id).grid(row=0, column=1, sticky='w', pady=5)
-            ttk.Label(form_frame, text="Product Name:").grid(row=1, column=0, sticky='w', pady=5)
-            name_entry = ttk.Entry(form_frame); name_entry.insert(0, product_name)
-            name_entry.grid(row=1, column=1, sticky='ew', pady=5)
-            ttk.Label(form_frame, text="Price (₹):").grid(row=2, column=0, sticky='w', pady=5)
-            price_entry = ttk.Entry(form_frame); price_entry.insert(0, product_price)
-            price_entry.grid(row=2, column=1, sticky='ew', pady=5)
-            def save_changes():
-                new_name, new_price_str = name_entry.get().strip(), price_entry.get().strip()
-                if not new_name or not new_price_str:
-                    messagebox.showerror("Error", "All fields are required.", parent=edit_window); return
-                try:
-                    new_price_val = float(new_price_str)
-                    self.products[product_id]['name'] = new_name
-                    self.products[product_id]['price'] = f"₹{new_price_val:.2f}"
-                    self.save_products(); self.populate_database_view()
-                    self.update_status(f"Product '{product_id}' updated."); edit_window.destroy()
-                except ValueError: messagebox.showerror("Error", "Price must be a valid number.", parent=edit_window)
-            save_btn = ttk.Button(form_frame, text="Save Changes", command=save_changes)
-            save_btn.grid(row=3, columnspan=2, pady=15)
+            product_id = self.db_tree.selection()[0]  # Row iids are product IDs.
+            product = self.products[product_id]
+            if self._edit_window is None: self._create_edit_window()
+            self._edit_id_var.set(product_id)
+            self._edit_name_var.set(product['name'])
+            self._edit_price_var.set(f"{product['price']:.2f}")
+            self._edit_window.deiconify(); self._edit_window.lift()
         except IndexError: self.update_status("No product selected to edit.", is_error=True)
+        except KeyError: self.update_status(f"Product '{product_id}' no longer exists.", is_error=True)
+
+    def _create_edit_window(self):
+        """Builds the edit dialog once; later edits just refill its variables and show it again."""
+        self._edit_id_var, self._edit_name_var, self._edit_price_var = tk.StringVar(), tk.StringVar(), tk.StringVar()
+        self._edit_window = ttk.Toplevel(self.root, title="Edit Product")
+        self._edit_window.transient(self.root); self._edit_window.geometry("400x200")
+        self._edit_window.protocol("WM_DELETE_WINDOW", self._edit_window.withdraw)
+        form_frame = ttk.Frame(self._edit_window, padding=20)
+        form_frame.pack(expand=True, fill=BOTH); form_frame.columnconfigure(1, weight=1)
+        ttk.Label(form_frame, text="Product ID:").grid(row=0, column=0, sticky='w', pady=5)
+        ttk.Label(form_frame, textvariable=self._edit_id_var).grid(row=0, column=1, sticky='w', pady=5)
+        ttk.Label(form_frame, text="Product Name:").grid(row=1, column=0, sticky='w', pady=5)
+        ttk.Entry(form_frame, textvariable=self._edit_name_var).grid(row=1, column=1, sticky='ew', pady=5)
+        ttk.Label(form_frame, text="Price (₹):").grid(row=2, column=0, sticky='w', pady=5)
+        ttk.Entry(form_frame, textvariable=self._edit_price_var).grid(row=2, column=1, sticky='ew', pady=5)
+        save_btn = ttk.Button(form_frame, text="Save Changes", command=self._save_product_edit)
+        save_btn.grid(row=3, columnspan=2, pady=15)
+
+    def _save_product_edit(self):
+        product_id = self._edit_id_var.get()
+        if product_id not in self.products:
+            self._edit_window.withdraw(); self.update_status(f"Product '{product_id}' no longer exists.", is_error=True); return
+        new_name, new_price_str = self._edit_name_var.get().strip(), self._edit_price_var.get().strip()
+        if not new_name or not new_price_str:
+            messagebox.showerror("Error", "All fields are required.", parent=self._edit_window); return
+        try:
+            new_price = float(new_price_str)
+            if not math.isfinite(new_price): raise ValueError(new_price_str)
+            self.products[product_id] = {"name": new_name, "price": new_price}
+            self.save_products()
+            if self.db_tree.exists(product_id): self._update_db_row(product_id, (product_id, new_name, _fmt_price(new_price)))
+            self.update_status(f"Product '{product_id}' updated."); self._edit_window.withdraw()
+        except ValueError: messagebox.showerror("Error", "Price must be a valid number.", parent=self._edit_window)
+
+    def _confirm_delete(self, message: str) -> bool:
+        """Yes/No delete confirmation that the user can switch off for the rest of the session."""
+        if self._skip_confirm: return True
+        confirmed, skip_var = tk.BooleanVar(self.root, value=False), tk.BooleanVar(self.root, value=False)
+        dialog = ttk.Toplevel(self.root, title="Confirm Delete")
+        dialog.transient(self.root); dialog.resizable(False, False)
+        ttk.Label(dialog, text=message, padding=20, wraplength=360).pack()
+        ttk.Checkbutton(dialog, text="Don't ask again this session", variable=skip_var).pack(padx=20, anchor=W)
+        def answer(yes: bool):
+            confirmed.set(yes)
+            if yes and skip_var.get(): self._skip_confirm = True
+            dialog.destroy()
+        button_frame = ttk.Frame(dialog); button_frame.pack(pady=15)
+        yes_btn = ttk.Button(button_frame, text="Yes", bootstyle=DANGER, command=lambda: answer(True))
+        yes_btn.pack(side=LEFT, padx=5)
+        ttk.Button(button_frame, text="No", command=lambda: answer(False), bootstyle=(SECONDARY, OUTLINE)).pack(side=LEFT, padx=5)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: answer(False))
+        # Keyboard behaviour of askyesno: Return activates the focused button (Yes by default), Escape answers No.
+        dialog.bind('<Return>', lambda e: e.widget.invoke() if isinstance(e.widget, ttk.Button) else answer(True))
+        dialog.bind('<Escape>', lambda e: answer(False))
+        self.root.eval(f'tk::PlaceWindow {str(dialog)} widget {str(self.root)}')
+        dialog.wait_visibility()  # A grab on an unmapped window fails on X11.
+        dialog.grab_set(); yes_btn.focus_set()
+        self.root.wait_window(dialog)
+        return confirmed.get()
 
     def delete_product(self):
         try:
             selected_item = self.db_tree.selection()[0]
-            product_id = self.db_tree.item(selected_item, 'values')[0]
-            if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete product '{product_id}'?"):
-                del self.products[product_id]; self.save_products(); self.populate_database_view()
+            product_id = selected_item
+            if self._confirm_delete(f"Are you sure you want to delete product '{product_id}'?"):
+                del self.products[product_id]; self.save_products(); self._remove_db_row(selected_item)
                 self.update_status(f"Product '{product_id}' deleted.")
         except IndexError: self.update_status("No product selected.", is_error=True)
     def delete_history_item(self):
         try:
             selected_items = self.history_tree.selection()
             if not selected_items: raise IndexError
-            if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(selected_items)} history item(s)?"):
-                indices_to_delete = sorted([self.history_tree.index(i) for i in selected_items], reverse=True)
-                for index in indices_to_delete: del self.scan_history[index]
-                self.populate_history_view(); self.update_status(f"{len(selected_items)} history item(s) deleted.")
+            if self._confirm_delete(f"Are you sure you want to delete {len(selected_items)} history item(s)?"):
+                self.history_tree.delete(*selected_items); self.update_status(f"{len(selected_items)} history item(s) deleted.")
         except IndexError: self.update_status("No history item selected.", is_error=True)
     def add_to_history(self, data: str, data_type: str):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.scan_history.insert(0, {"timestamp": timestamp, "data": data, "type": data_type})
-        self.populate_history_view()
+        timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
+        # The history tab's Treeview is the only record of past scans; newest first.
+        if hasattr(self, 'history_tree'): self.history_tree.insert("", 0, values=(timestamp, data_type, data))
     def copy_to_clipboard(self, text: str):
-        self.root.clipboard_clear(); self.root.clipboard_append(text)
+        if text != self._last_clip:
+            self.root.clipboard_clear(); self.root.clipboard_append(text)
+            self._last_clip = text
         self.update_status(f"Copied to clipboard: '{text[:30]}...'")
+    def _forget_clipboard(self, _event=None): self._last_clip = None
     def copy_history_selection(self):
         try:
             selected_item = self.history_tree.selection()[0]
@@ -573,16 +911,24 @@ class QuantumLinkApp:
         if is_error:
             self.status_bar.config(text=f"⚠️ {message}", bootstyle=DANGER); messagebox.showerror("Error", message)
         else: self.status_bar.config(text=f"✔️ {message}", bootstyle=DEFAULT)
-        self.root.update_idletasks()
     def export_to_csv(self):
         if not self.products: messagebox.showwarning("Export Failed", "The product database is empty."); return
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")], title="Save Database as CSV")
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz")], title="Save Database as CSV")
         if not file_path: return
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f); writer.writerow(['product_id', 'name', 'price'])
-                for pid, data in self.products.items(): writer.writerow([pid, data['name'], data['price']])
-            self.update_status(f"Database exported successfully.")
+        self.update_status("Exporting database...")
+        # rows() is materialised here, on the Tk thread that owns the SQLite connection.
+        future = IO_POOL.submit(self._write_products_csv, file_path, self.products.rows())
+        future.add_done_callback(lambda fut: self.root.after(0, self._on_export_done, fut))
+    def _write_products_csv(self, file_path: str, rows: List[Tuple[str, str, float]]):
+        if file_path.endswith('.gz'):
+            # Level 1 deflate is cheaper than the disk/network I/O it saves.
+            f = gzip.open(file_path, 'wt', newline='', encoding='utf-8', compresslevel=1)
+        else: f = open(file_path, 'w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER)
+        with f:
+            writer = csv.writer(f); writer.writerow(['product_id', 'name', 'price'])
+            writer.writerows((pid, name, _fmt_price(price)) for pid, name, price in rows)
+    def _on_export_done(self, future: Future):
+        try: future.result(); self.update_status("Database exported successfully.")
         except IOError as e: self.update_status(f"Failed to export CSV: {e}", is_error=True)
     def change_theme(self):
         self.root.style.theme_use(self.theme_var.get()); self.update_status(f"Theme changed to '{self.theme_var.get()}'.")
@@ -590,20 +936,20 @@ class QuantumLinkApp:
         if self.last_generated_qr_img:
             file_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG files", "*.png")], title="Save QR Code As...")
             if file_path:
-                try:
-                    self.last_generated_qr_img.save(file_path)
-                    self.update_status(f"QR code saved to {os.path.basename(file_path)}")
-                except IOError as e: self.update_status(f"Failed to save image: {e}", is_error=True)
+                future = IO_POOL.submit(save_qr_png, self.last_generated_qr_img, file_path)
+                future.add_done_callback(lambda fut: self.root.after(0, self._on_qr_saved, fut, file_path))
+    def _on_qr_saved(self, future: Future, file_path: str):
+        try: future.result(); self.update_status(f"QR code saved to {os.path.basename(file_path)}")
+        except IOError as e: self.update_status(f"Failed to save image: {e}", is_error=True)
     def on_closing(self):
-        self.stop_webcam_scan(); self.save_app_config(); self.root.destroy()
+        self.stop_webcam_scan(); self._flush_products(); self.products.close(); self.save_app_config(); self.root.destroy()
         
 # --- Main Execution Block ---
 if __name__ == "__main__":
     config = {}
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, "r") as f: config = json.load(f)
-        except json.JSONDecodeError: pass
+    try:
+        with open(CONFIG_FILE, "rb") as f: config = orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError): pass
     app_theme = config.get("theme", "cyborg") 
     root = ttk.Window(themename=app_theme)
     QuantumLinkApp(root)